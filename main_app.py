@@ -1,10 +1,118 @@
+import hashlib
+import io
+import os
+import tempfile
+from pathlib import Path
+
+import pandas as pd
 import streamlit as st
-from wpu.data_loader import read_daily_wpu, read_minute_wpu, read_tick_wpu
-from wpu.processing import merge_resample_forward_fill, filter_by_zoom
+from wpu.data_loader import load_daily_exchange_rates, read_minute_wpu, read_tick_wpu
+from wpu.processing import merge_resample_forward_fill, filter_by_zoom, zoom_start
 from wpu.plotting import plot_price_line
 
 st.title("WPU Currency Basket Viewer")
 
+
+# -------------------------
+# Cached loaders
+# -------------------------
+# Streamlit reruns this script on every widget interaction. The loaders take
+# the uploaded bytes + filename so the cache is keyed on file content, and the
+# zoom selector only has to re-filter and re-plot.
+# Parquet cache for parsed uploads, next to this file rather than the cwd.
+# Bump CACHE_VERSION whenever a cached loader's output (columns, dtypes)
+# changes, so frames written by older code are never served.
+CACHE_DIR = Path(__file__).resolve().parent / ".cache"
+CACHE_VERSION = 1
+CACHE_MAX_FILES = 32
+
+
+def _as_file(data, name):
+    buf = io.BytesIO(data)
+    buf.name = name
+    return buf
+
+
+def _parquet_cached(data, name, loader):
+    """
+    Parse an upload once per file content: the tidy frame is written to
+    .cache/ as Parquet and read back in later sessions instead of re-parsing.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    cache_path = CACHE_DIR / f"{loader.__name__}-v{CACHE_VERSION}-{digest}.parquet"
+    try:
+        df = pd.read_parquet(cache_path, engine='pyarrow')
+    except OSError:  # not cached yet, evicted by another session, or unreadable
+        pass
+    else:
+        try:
+            os.utime(cache_path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return df
+
+    df = loader(_as_file(data, name))
+    try:
+        _write_parquet_cache(df, cache_path)
+    except OSError:
+        pass  # the cache is best-effort, e.g. in a read-only deployment
+    return df
+
+
+def _write_parquet_cache(df, cache_path):
+    CACHE_DIR.mkdir(exist_ok=True)
+    # write to a temp file and rename it into place, so a concurrent session
+    # never reads a half-written file
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, engine='pyarrow', compression='zstd',
+                      use_dictionary=['currency'])
+        os.replace(tmp_path, cache_path)
+    finally:
+        Path(tmp_path).unlink(missing_ok=True)
+    _evict_parquet_cache()
+
+
+def _evict_parquet_cache():
+    """Keep only the CACHE_MAX_FILES most recently used cache files."""
+    def mtime(path):
+        try:
+            return path.stat().st_mtime
+        except FileNotFoundError:  # removed by another session
+            return 0
+
+    files = sorted(CACHE_DIR.glob("*.parquet"), key=mtime, reverse=True)
+    for old in files[CACHE_MAX_FILES:]:
+        old.unlink(missing_ok=True)
+
+
+@st.cache_data(show_spinner=False)
+def load_daily(data, name):
+    return load_daily_exchange_rates(_as_file(data, name))
+
+
+@st.cache_data(show_spinner=False)
+def load_minute(data, name):
+    return read_minute_wpu(_as_file(data, name))
+
+
+@st.cache_data(show_spinner=False)
+def load_tick(data, name):
+    return _parquet_cached(data, name, read_tick_wpu)
+
+
+@st.cache_data(show_spinner=False)
+def merge_sources(digests, start, _daily_df, _minute_df, _tick_tidy):
+    # keyed on the uploads' sha256 digests: the leading underscores stop
+    # Streamlit hashing the frames, which only samples rows of large frames
+    return merge_resample_forward_fill(_daily_df, _minute_df, _tick_tidy, start=start)
+
+
+def _digest(file):
+    return None if file is None else hashlib.sha256(file.getvalue()).hexdigest()
+
+
 # Upload files
 daily_file = st.sidebar.file_uploader("Upload daily CSV (10 years)", type=['csv'])
 minute_file = st.sidebar.file_uploader("Upload minute CSV/XLSX (5 days)", type=['csv','xlsx'])
@@ -17,20 +125,27 @@ zoom_option = st.sidebar.selectbox(
     index=0
 )
 
-daily_raw = daily_tidy = None
-minute_raw = minute_tidy = None
-tick_tidy = None
+daily_df = minute_df = tick_tidy = None
 
 if daily_file is not None:
-    daily_raw, daily_tidy, _ = read_daily_wpu(daily_file)
+    daily_df = load_daily(daily_file.getvalue(), daily_file.name)
 
 if minute_file is not None:
-    minute_raw, minute_tidy, _ = read_minute_wpu(minute_file)
+    minute_df, _ = load_minute(minute_file.getvalue(), minute_file.name)
 
 if tick_file is not None:
-    tick_tidy = read_tick_wpu(tick_file)
+    tick_tidy = load_tick(tick_file.getvalue(), tick_file.name)
 
-if daily_tidy is not None:
-    merged_df = merge_resample_forward_fill(daily_tidy, minute_tidy, tick_tidy)
+if daily_df is not None:
+    # only merge the selected window; the start is floored to the day so the
+    # cached merge is reused across reruns, and filter_by_zoom trims exactly
+    start = zoom_start(zoom_option)
+    if start is not None:
+        start = start.floor('D')
+    digests = tuple(_digest(f) for f in (daily_file, minute_file, tick_file))
+    merged_df = merge_sources(digests, start, daily_df, minute_df, tick_tidy)
     zoomed_df = filter_by_zoom(merged_df, zoom=zoom_option)
-    plot_price_line(zoomed_df, price_col='price', title=f"WPUUSD Price ({zoom_option})")
+
+    # the merged frame has one price column per currency
+    currency = st.sidebar.selectbox("Currency", list(merged_df.columns))
+    plot_price_line(zoomed_df, price_col=currency, title=f"{currency} Price ({zoom_option})")
@@ -0,0 +1,47 @@
+import io
+
+import pandas as pd
+
+from wpu.data_loader import read_minute_wpu, read_tick_wpu
+
+
+def _upload(text, name):
+    buf = io.BytesIO(text.encode())
+    buf.name = name
+    return buf
+
+
+def test_read_tick_wpu_repeated_timestamp_headers():
+    csv = (
+        "Tick export\n"
+        "Timestamp,AUD=,Timestamp,BRL=\n"
+        "2024-01-02 03:04:05,0.65,2024-01-02 03:04:06,5.20\n"
+        "2024-01-02 03:05:05,0.66,2024-01-02 03:05:06,5.30\n"
+    )
+    tidy = read_tick_wpu(_upload(csv, "ticks.csv"))
+
+    assert list(tidy.columns) == ['datetime', 'price', 'currency']
+    assert tidy['currency'].tolist() == ['AUD', 'AUD', 'BRL', 'BRL']
+    assert tidy['price'].tolist() == pd.Series([0.65, 0.66, 5.20, 5.30], dtype='float32').tolist()
+    assert str(tidy['datetime'].dt.tz) == 'UTC'
+    assert tidy['datetime'].iloc[2] == pd.Timestamp('2024-01-02 03:04:06', tz='UTC')
+
+
+def test_read_tick_wpu_drops_unparseable_timestamps():
+    csv = (
+        "Tick export\n"
+        "Timestamp,AUD=,Timestamp,BRL=\n"
+        "2024-01-02 03:04:05,0.65,2024-01-02 03:04:06,5.20\n"
+        "bad,0.66,,\n"
+    )
+    tidy = read_tick_wpu(_upload(csv, "ticks.csv"))
+
+    assert tidy['currency'].tolist() == ['AUD', 'BRL']
+
+
+def test_read_minute_wpu_from_upload():
+    csv = "Timestamp,AUD=,BRL=\n2024-01-02 10:00,0.65,5.2\n2024-01-02 10:01,0.66,5.3\n"
+    raw, currencies = read_minute_wpu(_upload(csv, "minute.csv"))
+
+    assert currencies == ['AUD', 'BRL']
+    assert raw['datetime'].tolist() == list(pd.to_datetime(['2024-01-02 10:00', '2024-01-02 10:01']))
@@ -0,0 +1,18 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("altair")
+pytest.importorskip("streamlit")
+
+from wpu.plotting import _downsample
+
+
+@pytest.mark.parametrize("n", [1999, 2000, 4001, 4003, 10_000])
+def test_downsample_keeps_first_and_last_row(n):
+    df = pd.DataFrame({'price': range(n)})
+    out = _downsample(df, max_points=2000)
+
+    assert len(out) <= 2001
+    assert out['price'].iloc[0] == 0
+    assert out['price'].iloc[-1] == n - 1
+    assert out['price'].is_monotonic_increasing and out['price'].is_unique
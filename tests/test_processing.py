@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from wpu.processing import (
+    _overlay_sources,
+    _resample_ticks,
+    _trim_before,
+    calculate_wpu_price,
+    merge_resample_forward_fill,
+)
+
+
+def _random_sources(seed, ticks_before_start=False):
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp('2024-01-01', tz='UTC')
+
+    days = pd.date_range(base, periods=10, freq='D', name='datetime')
+    daily = pd.DataFrame(rng.random((len(days), 3)), columns=['AUD', 'BRL', 'CAD'])
+    daily[daily > 0.7] = np.nan
+    daily.insert(0, 'datetime', days)
+
+    # off-grid, irregular minute rows with gaps in each column
+    offsets = np.sort(rng.choice(10 * 24 * 60 * 60, 400, replace=False))
+    minute = pd.DataFrame(rng.random((len(offsets), 2)), columns=['AUD', 'BRL'])
+    minute[minute > 0.5] = np.nan
+    minute.insert(0, 'datetime', base + pd.to_timedelta(offsets, unit='s'))
+
+    # ticks_before_start: every tick in the first two days, start after them
+    tick_span = 2 if ticks_before_start else 10
+    tick_offsets = rng.choice(tick_span * 24 * 60 * 60 * 1000, 300)
+    ticks = pd.DataFrame({
+        'datetime': base + pd.to_timedelta(tick_offsets, unit='ms'),
+        'price': rng.random(len(tick_offsets)),
+        'currency': rng.choice(['AUD', 'CAD'], len(tick_offsets)),
+    })
+    start_day = tick_span if ticks_before_start else 0
+    start = base + pd.Timedelta(seconds=int(rng.integers(start_day * 24 * 60 * 60, 10 * 24 * 60 * 60)))
+    return daily, minute, ticks, start
+
+
+@pytest.mark.parametrize("ticks_before_start", [False, True])
+@pytest.mark.parametrize("seed", range(20))
+def test_merge_with_start_matches_untrimmed_merge(seed, ticks_before_start):
+    daily, minute, ticks, start = _random_sources(seed, ticks_before_start)
+
+    full = merge_resample_forward_fill(daily, minute, ticks, freq='1h')
+    trimmed = merge_resample_forward_fill(daily, minute, ticks, freq='1h', start=start)
+
+    pd.testing.assert_frame_equal(trimmed.loc[start:], full.loc[start:], check_freq=False)
+
+
+def test_trim_before_keeps_each_columns_last_value():
+    index = pd.date_range('2024-01-01', periods=5, freq='D', tz='UTC', name='datetime')
+    df = pd.DataFrame({'AUD': [1.0, np.nan, 2.0, np.nan, 3.0],
+                       'BRL': [4.0, 5.0, np.nan, np.nan, 6.0]}, index=index)
+
+    # BRL's last value before the 4th row is on the 2nd row
+    assert _trim_before(df, index[3]).index.equals(index[1:])
+    assert _trim_before(df, index[0]) is df
+    assert _trim_before(df, None) is df
+
+
+def test_overlay_sources_prefers_later_sources():
+    index = pd.date_range('2024-01-01', periods=3, freq='h', tz='UTC')
+    low = pd.DataFrame({'AUD': [1.0, 2.0, 3.0], 'BRL': [7.0, 8.0, 9.0]}, index=index)
+    high = pd.DataFrame({'AUD': [np.nan, 20.0], 'CAD': [5.0, 6.0]},
+                        index=index[1:] + pd.to_timedelta([0, 30], unit='min'))
+
+    merged = _overlay_sources([low, high])
+
+    assert merged.index.equals(index.union(high.index).rename('datetime'))
+    assert merged['AUD'].tolist()[:3] == [1.0, 2.0, 3.0]
+    assert merged['AUD'].iloc[-1] == 20.0
+    assert merged['BRL'].tolist()[:3] == [7.0, 8.0, 9.0]
+    assert merged['CAD'].iloc[1] == 5.0
+
+
+def test_resample_ticks_matches_per_currency_asof():
+    rng = np.random.default_rng(0)
+    base = pd.Timestamp('2024-01-01', tz='UTC')
+    ticks = pd.DataFrame({
+        'datetime': base + pd.to_timedelta(rng.choice(6 * 60 * 60, 200), unit='s'),
+        'price': rng.random(200),
+        'currency': rng.choice(['AUD', 'BRL'], 200),
+    })
+
+    out = _resample_ticks(ticks, '5min', 'UTC')
+
+    labels = pd.date_range(ticks['datetime'].min().floor('5min'),
+                           ticks['datetime'].max().floor('5min'), freq='5min')
+    assert out.index.equals(labels.rename('datetime'))
+    for currency, group in ticks.groupby('currency'):
+        series = group.sort_values('datetime', kind='stable').drop_duplicates('datetime', keep='last')
+        expected = series.set_index('datetime')['price'].reindex(labels, method='ffill')
+        np.testing.assert_array_equal(out[currency].to_numpy(), expected.to_numpy())
+
+
+def test_calculate_wpu_price_sees_in_place_weight_edits():
+    dates = pd.date_range('2024-01-01', periods=3, freq='D', name='Date')
+    weights = pd.DataFrame({'AUD': [1.0, 1.0, 1.0], 'BRL': [2.0, 2.0, 2.0]}, index=dates)
+    rates = pd.DataFrame({'datetime': dates, 'AUD': [1.0, 2.0, 3.0], 'BRL': [1.0, 1.0, 1.0]})
+
+    before = calculate_wpu_price(rates, weights)['WPUUSD'].tolist()
+    weights['BRL'] *= 2
+    after = calculate_wpu_price(rates, weights)['WPUUSD'].tolist()
+
+    assert before == [3.0, 4.0, 5.0]
+    assert after == [5.0, 6.0, 7.0]
@@ -0,0 +1,36 @@
+"""
+Numba kernels for the processing hot paths.
+
+numba is optional: when it can't be imported NUMBA_AVAILABLE is False and
+callers use the equivalent pandas code instead.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        # no-op stand-in so the module still imports without numba
+        def wrap(func):
+            return func
+        return wrap
+
+
+# Not parallel=True: Streamlit runs scripts in a worker thread, and numba's
+# default threading layer, once started from a non-main thread, hangs
+# interpreter exit. With ~10-12 currency columns there is little to split.
+@njit(cache=True)
+def ffill_2d(a):
+    """Forward-fill NaNs down each column of a 2-D float array, in place."""
+    for j in range(a.shape[1]):
+        last = np.nan
+        for i in range(a.shape[0]):
+            v = a[i, j]
+            if np.isnan(v):
+                a[i, j] = last
+            else:
+                last = v
+    return a
@@ -1,14 +1,36 @@
 import streamlit as st
 import altair as alt
 
-def plot_price_line(df, price_col='price', title='WPU Price', width=800, height=400):
+def _downsample(df, max_points):
     """
-    Plot a simple line chart of WPU prices
+    Stride df down to at most max_points rows (plus the last row), always
+    keeping the last row so the most recent price stays on the chart.
+    """
+    step = max(1, -(-len(df) // max_points))
+    if step == 1:
+        return df
+    positions = list(range(0, len(df), step))
+    if positions[-1] != len(df) - 1:
+        positions.append(len(df) - 1)
+    return df.iloc[positions]
+
+
+def plot_price_line(df, price_col='price', title='WPU Price', width=800, height=400, max_points=2000):
+    """
+    Plot a simple line chart of WPU prices.
+    The data is strided down to at most ~max_points rows first: the chart
+    can't show more points than it has pixels, and every row is serialized
+    to the browser.
     """
     if df.empty or price_col not in df.columns:
         st.warning("No data to plot")
         return
 
+    df = _downsample(df, max_points)
+    # Altair plots columns; merged frames carry datetime as their index
+    if 'datetime' not in df.columns:
+        df = df.reset_index()
+
     chart = alt.Chart(df).mark_line().encode(
         x='datetime:T',
         y=alt.Y(price_col, title='Price'),
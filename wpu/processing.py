@@ -1,42 +1,183 @@
+import re
+
+import numpy as np
 import pandas as pd
 
-def merge_resample_forward_fill(daily_df, minute_df=None, tick_df=None, freq='1min', tz='UTC'):
+from ._numba_kernels import NUMBA_AVAILABLE, ffill_2d
+
+def merge_resample_forward_fill(daily_df, minute_df=None, tick_df=None, freq='1min', tz='UTC', start=None):
     """
-    Merge daily, minute, and tick data into a single time series.
+    Merge daily, minute, and tick data into a single time series, indexed by
+    a sorted DatetimeIndex named 'datetime'.
+    - Where sources overlap, prefer tick > minute > daily per currency
     - Forward-fill missing prices per currency
     - Resample tick/minute to the given frequency
+    - If start is given, rows from start onwards match the untrimmed merge,
+      but earlier rows are only kept as far back as each currency's last
+      price before start
     """
-    dfs = []
+    sources = []  # lowest priority first
 
     if daily_df is not None:
-        df = daily_df.copy()
-        df = df.set_index('datetime').sort_index()
-        dfs.append(df)
+        df = _datetime_indexed(daily_df, tz)
+        sources.append(_trim_before(df, start))
 
     if minute_df is not None:
-        df = minute_df.copy()
-        df = df.set_index('datetime').sort_index()
-        df = df.resample(freq).ffill()
-        dfs.append(df)
+        df = _datetime_indexed(minute_df, tz)
+        # trim on the freq grid: which raw row a label picks up depends on
+        # the rows after it, so trimming the raw rows could shift values
+        sources.append(_trim_before(_resample_ffill(df, freq), start))
 
     if tick_df is not None:
-        # pivot tick_df to wide format by currency, then resample
-        pivot = tick_df.pivot(index='datetime', columns='currency', values='price')
-        pivot = pivot.sort_index().resample(freq).ffill()
-        dfs.append(pivot)
+        # bin ticks straight onto the freq grid, one column per currency
+        sources.append(_resample_ticks(tick_df, freq, tz, start))
 
-    if dfs:
-        merged = pd.concat(dfs, axis=1)
+    if sources:
+        merged = _overlay_sources(sources)
         # forward-fill any remaining missing values
-        merged = merged.ffill()
+        merged = _ffill_frame(merged)
     else:
         merged = pd.DataFrame()
 
-    # reset index to have datetime column
-    merged = merged.reset_index()
     return merged
 
 
+def _overlay_sources(sources):
+    """
+    Combine datetime-indexed wide frames on the union of their timestamps,
+    filling one pre-allocated array. Sources come lowest priority first, and
+    each non-null value overwrites lower-priority values in the same cell.
+    Non-numeric columns are dropped.
+    """
+    sources = [src.select_dtypes('number') for src in sources]
+    index = sources[0].index
+    for src in sources[1:]:
+        index = index.union(src.index)
+
+    columns = list(dict.fromkeys(c for src in sources for c in src.columns))
+    col_pos = {c: j for j, c in enumerate(columns)}
+    dtype = np.result_type(np.float32, *(dt for src in sources for dt in src.dtypes))
+    out = np.full((len(index), len(columns)), np.nan, dtype=dtype)
+
+    for src in sources:
+        rows = index.searchsorted(src.index)
+        for c in src.columns:
+            values = src[c].to_numpy(dtype)
+            valid = ~np.isnan(values)
+            out[rows[valid], col_pos[c]] = values[valid]
+
+    return pd.DataFrame(out, index=index.rename('datetime'), columns=columns)
+
+
+def _resample_ffill(df, freq):
+    """
+    Put a sorted, datetime-indexed frame on a regular freq grid: each label
+    holds the last row at or before it, done as one reindex onto the labels.
+
+    Unlike df.resample(freq).ffill(), this never looks ahead. For regular
+    data off the grid (e.g. every minute at :30s) pandas relabels each row
+    to the label before it, whereas here a label only sees earlier rows.
+    """
+    if df.empty:
+        return df
+    if not df.index.is_unique:
+        df = df[~df.index.duplicated(keep='last')]
+    labels = pd.date_range(df.index[0].floor(freq), df.index[-1].floor(freq),
+                           freq=freq, name=df.index.name)
+    return df.reindex(labels, method='ffill')
+
+
+def _resample_ticks(tick_df, freq, tz, start=None):
+    """
+    Reshape long tick data to one column per currency on a regular freq grid.
+    Each label holds every currency's last tick at or before it, i.e. the
+    labels and as-of rule of resample(freq).ffill(), without the sparse pivot.
+    With start, the grid begins at start and earlier ticks act as anchors;
+    if every tick is before start, the grid keeps its last label as anchor.
+    """
+    ts = pd.DatetimeIndex(tick_df['datetime'])
+    if ts.tz is None:
+        ts = ts.tz_localize(tz)
+    if ts.empty:
+        return pd.DataFrame(index=ts.rename('datetime'))
+
+    first, last = ts.min().floor(freq), ts.max().floor(freq)
+    if start is not None:
+        first = min(max(first, start.floor(freq)), last)
+    labels = pd.date_range(first, last, freq=freq, name='datetime')
+
+    prices = tick_df['price'].to_numpy()
+    cur_code, currencies = pd.factorize(tick_df['currency'], sort=True)
+    valid = ~np.isnan(prices)
+
+    # label position of each tick: the first label at or after it
+    freq_ns = pd.Timedelta(freq).value
+    delta = ts.as_unit('ns').asi8 - first.as_unit('ns').value
+    pos = np.maximum(-(-delta // freq_ns), 0)
+    valid &= pos < len(labels)
+
+    # keep the latest tick per (label, currency) cell
+    order = np.argsort(ts.asi8[valid], kind='stable')
+    cells = (pos[valid] * len(currencies) + cur_code[valid])[order]
+    _, last_rev = np.unique(cells[::-1], return_index=True)
+    keep = order[len(cells) - 1 - last_rev]
+
+    out = np.full((len(labels), len(currencies)), np.nan,
+                  dtype=np.result_type(prices.dtype, np.float32))
+    out[pos[valid][keep], cur_code[valid][keep]] = prices[valid][keep]
+    return pd.DataFrame(_ffill_columns(out), index=labels, columns=currencies)
+
+
+def _ffill_frame(df):
+    """DataFrame.ffill(), using the Numba kernel for all-float frames."""
+    if NUMBA_AVAILABLE and len(set(df.dtypes)) == 1 and df.dtypes.iloc[0].kind == 'f':
+        return pd.DataFrame(ffill_2d(df.to_numpy(copy=True)), index=df.index, columns=df.columns)
+    return df.ffill()
+
+
+def _ffill_columns(arr):
+    """Forward-fill NaNs down each column of a 2-D float array."""
+    if NUMBA_AVAILABLE:
+        return ffill_2d(arr)
+    rows = np.where(np.isnan(arr), 0, np.arange(arr.shape[0])[:, None])
+    np.maximum.accumulate(rows, axis=0, out=rows)
+    return np.take_along_axis(arr, rows, axis=0)
+
+
+def _trim_before(df, start):
+    """
+    Drop the rows of a sorted, datetime-indexed frame that are not needed
+    from start onwards. The frame is kept from the earliest row holding some
+    column's last valid value before start, so forward-filling (or
+    overlaying) the result gives the same values from start as the full frame.
+    """
+    if start is None:
+        return df
+    lo = df.index.searchsorted(start, side='left')
+    if lo == 0:
+        return df
+    valid = df.iloc[:lo].notna().to_numpy()
+    seen = valid.any(axis=0)
+    if not seen.any():
+        return df.iloc[lo:]
+    last_valid = lo - 1 - valid[::-1].argmax(axis=0)
+    return df.iloc[last_valid[seen].min():]
+
+
+def _datetime_indexed(df, tz):
+    """
+    Index df by its 'datetime' column, sorted and in tz. Loaded data is
+    usually already in time order, so the sort only runs when needed; a naive
+    index is localized so all sources sort on the same clock.
+    """
+    df = df.set_index('datetime')
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    if df.index.tz is None:
+        df.index = df.index.tz_localize(tz)
+    return df
+
+
 ZOOM_MAPPING = {
     '1d': 'tick',      # tick data preferred
     '5d': 'minute',    # minute data preferred
@@ -50,35 +191,46 @@ ZOOM_MAPPING = {
     '10y': 'daily'
 }
 
+_ZOOM_RE = re.compile(r'(\d+)([dwmy])')
+_ZOOM_OFFSETS = {
+    'd': lambda n: pd.Timedelta(days=n),
+    'w': lambda n: pd.Timedelta(weeks=n),
+    'm': lambda n: pd.DateOffset(months=n),
+    'y': lambda n: pd.DateOffset(years=n),
+}
+
+def zoom_start(zoom, tz='UTC'):
+    """
+    Start timestamp of the window shown for a zoom level ('1d', '3m', ...),
+    counted back from now. Returns None for an unrecognized zoom (show all).
+    """
+    match = _ZOOM_RE.fullmatch(zoom)
+    if match is None:
+        return None
+    return pd.Timestamp.now(tz=tz) - _ZOOM_OFFSETS[match[2]](int(match[1]))
+
+
 def filter_by_zoom(df, zoom='1d', price_col='price'):
     """
-    Filter or resample merged dataframe based on zoom level
+    Filter or resample merged dataframe based on zoom level.
+    Expects a sorted DatetimeIndex (as returned by merge_resample_forward_fill).
     """
     if df.empty:
         return df
 
-    now = pd.Timestamp.now(tz=df['datetime'].dt.tz)
-    if zoom.endswith('d'):
-        delta_days = int(zoom[:-1])
-        start = now - pd.Timedelta(days=delta_days)
-    elif zoom.endswith('w'):
-        delta_weeks = int(zoom[:-1])
-        start = now - pd.Timedelta(weeks=delta_weeks)
-    elif zoom.endswith('m'):
-        delta_months = int(zoom[:-1])
-        start = now - pd.DateOffset(months=delta_months)
-    elif zoom.endswith('y'):
-        delta_years = int(zoom[:-1])
-        start = now - pd.DateOffset(years=delta_years)
-    else:
-        start = df['datetime'].min()
+    start = zoom_start(zoom, tz=df.index.tz)
+    if start is None:
+        return df
 
-    filtered = df[df['datetime'] >= start].copy()
+    # the index is sorted, so binary-search the cutoff instead of building a
+    # boolean mask over every row
+    lo = df.index.searchsorted(start, side='left')
+    filtered = df.iloc[lo:]
     return filtered
 
 
 
-def calculate_wpu_price(rate_df, weights_df, date_col="datetime"):
+def calculate_wpu_price(rate_df, weights_df, date_col="datetime", dtype=np.float32, validate=False):
     """
     Calculate WPUUSD from wide-format exchange rate data and daily weights.
 
@@ -92,39 +244,62 @@ def calculate_wpu_price(rate_df, weights_df, date_col="datetime"):
         Daily WPU weights. Columns: ['AUD', 'BRL', ..., 'USD'], indexed by date.
     date_col : str
         Column in rate_df containing timestamps.
+    dtype : numpy dtype
+        Precision of the weighted sum. float32 halves the memory traffic and
+        is ample for FX rates and weights.
+    validate : bool
+        Also compute the sum in float64 and raise ValueError if the two
+        disagree beyond float32 tolerance.
 
     Returns
     -------
     pd.DataFrame
         DataFrame with ['datetime', 'WPUUSD']
     """
-    df = rate_df.copy()
-    df[date_col] = pd.to_datetime(df[date_col])
+    df = rate_df
+    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
+        df = df.assign(**{date_col: pd.to_datetime(df[date_col])})
+    # sort_values returns a new frame, so the caller's rate_df is never mutated
     df = df.sort_values(date_col).reset_index(drop=True)
 
-    # Forward-fill missing rates per currency
-    currency_cols = [c for c in df.columns if c != date_col]
-    df[currency_cols] = df[currency_cols].ffill()
-
     # Prepare weights: ensure index is datetime and forward-fill missing weights
-    weights = weights_df.copy()
+    weights = weights_df
     if not pd.api.types.is_datetime64_any_dtype(weights.index):
-        weights.index = pd.to_datetime(weights.index)
+        weights = weights.set_axis(pd.to_datetime(weights.index))
     weights = weights.sort_index().ffill()
 
-    # Align each timestamp with the appropriate daily weights
-    df['weight_date'] = df[date_col].dt.floor('D')  # truncate to date
-    merged = df.merge(weights, left_on='weight_date', right_index=True,
-                      how='left', suffixes=('', '_wt'))
+    # Only currencies with both a rate and a weight contribute; resolve them
+    # once and forward-fill missing rates for just those columns
+    cols = [c for c in df.columns if c != date_col and c in weights.columns]
+    df[cols] = df[cols].ffill()
 
-    # Construct weight column names
-    wt_cols = [c + '_wt' for c in currency_cols]
+    # Align each timestamp with the latest weights on or before it: one binary
+    # search over the sorted weight dates, then a single gather of weight rows
+    pos = _naive_utc(weights.index).searchsorted(_naive_utc(df[date_col]), side='right') - 1
+    valid = pos >= 0  # timestamps before the first weights date get no weight
+    wts = np.zeros((len(df), len(cols)), dtype=dtype)
+    wts[valid] = weights[cols].to_numpy(dtype)[pos[valid]]
 
-    # Forward-fill missing weights (in case of missing merge)
-    merged[wt_cols] = merged[wt_cols].ffill()
+    # Compute WPUUSD = sum(rate * weight) as one fused multiply-reduce over the
+    # aligned arrays; missing values count as 0, as in a skipna sum
+    rates = np.nan_to_num(df[cols].to_numpy(dtype))
+    wts = np.nan_to_num(wts)
+    wpu = np.einsum('ij,ij->i', rates, wts)
 
-    # Compute WPUUSD = sum(rate * weight)
-    merged['WPUUSD'] = merged[currency_cols].mul(merged[wt_cols], axis=0).sum(axis=1)
+    if validate:
+        wpu64 = calculate_wpu_price(rate_df, weights_df, date_col, dtype=np.float64)['WPUUSD']
+        if not np.allclose(wpu, wpu64.to_numpy(), rtol=1e-5):
+            raise ValueError(f"WPUUSD in {np.dtype(dtype)} deviates from the float64 result")
+
+    df['WPUUSD'] = wpu.astype(np.float64)
 
     # Return only datetime and WPUUSD
-    return merged[[date_col, 'WPUUSD']].copy()
+    return df[[date_col, 'WPUUSD']]
+
+
+def _naive_utc(values):
+    """DatetimeIndex in naive UTC, so tz-aware and naive timestamps compare."""
+    idx = pd.DatetimeIndex(values)
+    if idx.tz is not None:
+        idx = idx.tz_convert(None)
+    return idx.as_unit('ns')